@@ -1,6 +1,7 @@
 import streamlit as st
-import pandas as pd
-from datetime import datetime, timedelta
+import requests
+from concurrent.futures import ThreadPoolExecutor
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 from components.graphs import (
     plot_training_load_index,
     plot_metrics,
@@ -86,16 +87,36 @@ def main():
     # Step 3: Fetch and process data if logged in
     access_token = st.session_state["access_token"]
     try:
-        data = fetch_oura_data(access_token)
+        # The three API calls are independent, so issue them concurrently.
+        # Worker threads need the script run context to use st.cache_data.
+        ctx = get_script_run_ctx()
+        with ThreadPoolExecutor(
+            max_workers=3, initializer=add_script_run_ctx, initargs=(None, ctx)
+        ) as executor:
+            data_future = executor.submit(fetch_oura_data, access_token)
+            resting_hr_future = executor.submit(fetch_user_resting_hr, access_token)
+            max_hr_future = executor.submit(fetch_user_max_hr, access_token)
+
+            data = data_future.result()
+
+            try:
+                resting_hr = resting_hr_future.result() or 60
+            except requests.HTTPError:
+                st.error("Failed to fetch resting HR data.")
+                resting_hr = 60
+
+            try:
+                max_hr = max_hr_future.result()
+            except requests.HTTPError:
+                st.error("Failed to fetch user info.")
+                return
+
         data = calculate_training_load_index(data)
 
         readiness_score = data["readiness_score"].iloc[-1]
         activity_score = data["activity_score"].iloc[-1]
         hrv_balance = data["hrv_balance"].iloc[-1]
 
-        resting_hr = fetch_user_resting_hr(access_token) or 60
-        max_hr = fetch_user_max_hr(access_token)
-
         training_load_ratio = (
             data["training_load_index"].iloc[-1]
             / data["training_load_index"].mean()
@@ -1,21 +1,20 @@
 import numpy as np
 import streamlit as st
 import plotly.graph_objects as go
+from plotly.subplots import make_subplots
 
 
-def plot_training_load_index(training_data, fit_line=True):
-    """Plot the training load index over time using Plotly.
-    Optionally fit linear line to show direction of change.
-    """
+@st.cache_data(ttl=3600, max_entries=32, show_spinner=False)
+def _build_training_load_index_fig(training_data, fit_line=True):
+    """Build the training load index figure, cached on the plotted columns."""
     if fit_line:
-        # Fit a linear regression line to the training load index
+        # Fit a least-squares line to the training load index
         x = np.arange(len(training_data["training_load_index"]))
         y = training_data["training_load_index"].values
-        coefficients = np.polyfit(x, y, 1)
-        trend_line = np.polyval(coefficients, x)
-        training_data["trend_line"] = trend_line
-    else:
-        training_data["trend_line"] = None
+        x_centered = x - x.mean()
+        slope = (x_centered * (y - y.mean())).sum() / (x_centered ** 2).sum()
+        intercept = y.mean() - slope * x.mean()
+        trend_line = slope * x + intercept
     # Create the Plotly figure
 
     fig = go.Figure()
@@ -32,7 +31,7 @@ def plot_training_load_index(training_data, fit_line=True):
     if fit_line:
         fig.add_trace(go.Scatter(
             x=training_data["day"],
-            y=training_data["trend_line"],
+            y=trend_line,
             mode="lines",
             line=dict(color="#FF6347", width=2, dash="dash"),
             name="Trend Line"
@@ -48,67 +47,64 @@ def plot_training_load_index(training_data, fit_line=True):
         font=dict(color="white"),
     )
 
+    return fig
+
+
+def plot_training_load_index(training_data, fit_line=True):
+    """Plot the training load index over time using Plotly.
+    Optionally fit linear line to show direction of change.
+    """
+    fig = _build_training_load_index_fig(
+        training_data[["day", "training_load_index"]], fit_line
+    )
     st.plotly_chart(fig, use_container_width=True)
 
+
+# (title, suffix, color) for each indicator, in 2×2 grid order
+_METRIC_INDICATORS = [
+    ("Readiness", " / 100", "#1E90FF"),
+    ("Activity", " / 100", "#FFD700"),
+    ("Resting HR", " bpm", "#20B2AA"),
+    ("HRV Balance", " / 100", "#FF4500"),
+]
+
+
+@st.cache_data(ttl=3600, max_entries=32, show_spinner=False)
+def _build_metrics_fig(readiness, activity, resting_hr, hrv_balance):
+    """Build the 2×2 grid of number indicators as a single figure."""
+    fig = make_subplots(rows=2, cols=2, specs=[[{"type": "indicator"}] * 2] * 2)
+    values = [readiness, activity, resting_hr, hrv_balance]
+    for i, (value, (title, suffix, color)) in enumerate(zip(values, _METRIC_INDICATORS)):
+        fig.add_trace(
+            go.Indicator(
+                mode="number",
+                value=value,
+                title={"text": title},
+                number={"suffix": suffix, "font": {"color": color}},
+            ),
+            row=i // 2 + 1,
+            col=i % 2 + 1,
+        )
+    fig.update_layout(height=300, margin=dict(t=30, b=10))
+    return fig
+
+
 def plot_metrics(readiness, activity, resting_hr, hrv_balance):
     """Display user metrics as 2×2 grid of indicators in Streamlit."""
-    # First row
-    row1_col1, row1_col2 = st.columns(2)
-    with row1_col1:
-        fig = go.Figure(go.Indicator(
-            mode="number",
-            value=readiness,
-            title={"text": "Readiness"},
-            number={"suffix": " / 100", "font": {"color": "#1E90FF"}},
-        ))
-        fig.update_layout(height=150, margin=dict(t=30, b=10))
-        st.plotly_chart(fig, use_container_width=True)
-
-    with row1_col2:
-        fig = go.Figure(go.Indicator(
-            mode="number",
-            value=activity,
-            title={"text": "Activity"},
-            number={"suffix": " / 100", "font": {"color": "#FFD700"}},
-        ))
-        fig.update_layout(height=150, margin=dict(t=30, b=10))
-        st.plotly_chart(fig, use_container_width=True)
-
-    # Second row
-    row2_col1, row2_col2 = st.columns(2)
-    with row2_col1:
-        fig = go.Figure(go.Indicator(
-            mode="number",
-            value=resting_hr,
-            title={"text": "Resting HR"},
-            number={"suffix": " bpm", "font": {"color": "#20B2AA"}},
-        ))
-        fig.update_layout(height=150, margin=dict(t=30, b=10))
-        st.plotly_chart(fig, use_container_width=True)
-
-    with row2_col2:
-        fig = go.Figure(go.Indicator(
-            mode="number",
-            value=hrv_balance,
-            title={"text": "HRV Balance"},
-            number={"suffix": " / 100", "font": {"color": "#FF4500"}},
-        ))
-        fig.update_layout(height=150, margin=dict(t=30, b=10))
-        st.plotly_chart(fig, use_container_width=True)
+    fig = _build_metrics_fig(readiness, activity, resting_hr, hrv_balance)
+    st.plotly_chart(fig, use_container_width=True)
 
 
-def plot_hr_zone_ranges(zones):
-    """
-    Plot HR zones as horizontal range bars with endpoint labels using Plotly.
-
-    Parameters:
-    - zones: dict {zone_number: (low_hr, high_hr)}
-    """
+@st.cache_data(ttl=3600, max_entries=32, show_spinner=False)
+def _build_hr_zone_ranges_fig(zones):
+    """Build the HR zone range figure, cached on the zone bounds."""
     zones_sorted = sorted(zones.items())
     zone_labels = [f"Zone {z}" for z, _ in zones_sorted]
-    low_values = [low for _, (low, _) in zones_sorted]
-    high_values = [high for _, (_, high) in zones_sorted]
-    range_widths = [high - low for low, high in zip(low_values, high_values)]
+    low_values = np.fromiter((low for _, (low, _) in zones_sorted), dtype=np.int32)
+    high_values = np.fromiter((high for _, (_, high) in zones_sorted), dtype=np.int32)
+    range_widths = high_values - low_values
+    low_text = low_values.astype(str)
+    high_text = high_values.astype(str)
 
     colors = ['#4CAF50', '#8BC34A', '#FFC107', '#FF9800', '#F44336']
 
@@ -121,23 +117,23 @@ def plot_hr_zone_ranges(zones):
         base=low_values,
         orientation='h',
         marker_color=colors[:len(zones_sorted)],
-        text=[f"{low}–{high} bpm" for low, high in zip(low_values, high_values)],
+        text=np.char.add(np.char.add(low_text, "–"), np.char.add(high_text, " bpm")),
         hoverinfo="text",
         marker_line=dict(color='black', width=1),
         name="HR Zones"
     ))
 
-    # Add scatter points at start and end of each bar with text labels
-    for y, low, high in zip(zone_labels, low_values, high_values):
-        fig.add_trace(go.Scatter(
-            x=[low, high],
-            y=[y, y],
-            mode="text",
-            text=[f"{low}", f"{high}"],
-            textposition="middle right",
-            showlegend=False,
-            hoverinfo="skip"
-        ))
+    # Add text labels at start and end of each bar in a single trace
+    endpoints = np.concatenate([low_values, high_values])
+    fig.add_trace(go.Scatter(
+        x=endpoints,
+        y=zone_labels * 2,
+        mode="text",
+        text=np.concatenate([low_text, high_text]),
+        textposition="middle right",
+        showlegend=False,
+        hoverinfo="skip"
+    ))
 
     fig.update_layout(
         title="Heart Rate Zones (Horizontal Ranges)",
@@ -148,4 +144,15 @@ def plot_hr_zone_ranges(zones):
         margin=dict(l=60, r=40, t=60, b=40)
     )
 
+    return fig
+
+
+def plot_hr_zone_ranges(zones):
+    """
+    Plot HR zones as horizontal range bars with endpoint labels using Plotly.
+
+    Parameters:
+    - zones: dict {zone_number: (low_hr, high_hr)}
+    """
+    fig = _build_hr_zone_ranges_fig(zones)
     st.plotly_chart(fig, use_container_width=True)
@@ -1,12 +1,40 @@
+import numpy as np
+import orjson
 import pandas as pd
 import streamlit as st
 import requests
 from datetime import datetime, timedelta
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+@st.cache_resource(show_spinner=False)
+def get_http_session():
+    """Return the shared session so keep-alive connections are reused across Oura API calls."""
+    session = requests.Session()
+    session.mount(
+        "https://",
+        HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=8,
+            max_retries=Retry(total=3, backoff_factor=0.3),
+        ),
+    )
+    return session
+
 
+# Activity columns that make up the training load index
+_TRAINING_LOAD_COLUMNS = [
+    "activity_score",
+    "medium_activity_met_minutes",
+    "high_activity_met_minutes",
+    "training_volume",
+    "average_met_minutes",
+]
 
-def normalize_column(col):
-    """Normalize column values to a 0-1 range."""
-    return (col - col.min()) / (col.max() - col.min())
+# Base intensities (fraction of HR reserve) for zones 1-5
+_ZONE_LOW_PCT = np.array([0.50, 0.60, 0.70, 0.80, 0.90])
+_ZONE_HIGH_PCT = np.array([0.60, 0.70, 0.80, 0.90, 1.00])
 
 
 def adaptive_karvonen_zone_bounds(hr_rest, hr_max, readiness, acr):
@@ -23,15 +51,6 @@ def adaptive_karvonen_zone_bounds(hr_rest, hr_max, readiness, acr):
     - dict {zone_num: (min_hr, max_hr)} with adapted zones
     """
 
-    # Base intensities for zones
-    base_intensities = {
-        1: (0.50, 0.60),
-        2: (0.60, 0.70),
-        3: (0.70, 0.80),
-        4: (0.80, 0.90),
-        5: (0.90, 1.00),
-    }
-
     hr_reserve = hr_max - hr_rest
 
     # Calculate modifier: 
@@ -45,20 +64,17 @@ def adaptive_karvonen_zone_bounds(hr_rest, hr_max, readiness, acr):
     # Clamp modifier between 0.85 and 1.15 to avoid extremes
     modifier = max(0.925, min(modifier, 1.075))
 
-    zones = {}
-    for zone, (low_pct, high_pct) in base_intensities.items():
-        adj_low = low_pct * modifier
-        adj_high = high_pct * modifier
-        # Clamp adjusted intensities to max 1.0 (100%)
-        adj_low = min(adj_low, 1.0)
-        adj_high = min(adj_high, 1.0)
+    # Clamp adjusted intensities to max 1.0 (100%)
+    adj_low = np.minimum(_ZONE_LOW_PCT * modifier, 1.0)
+    adj_high = np.minimum(_ZONE_HIGH_PCT * modifier, 1.0)
 
-        min_hr = round(hr_rest + hr_reserve * adj_low)
-        max_hr = round(hr_rest + hr_reserve * adj_high)
-        zones[zone] = (min_hr, max_hr)
-    return zones 
+    min_hrs = np.rint(hr_rest + hr_reserve * adj_low).astype(int)
+    max_hrs = np.rint(hr_rest + hr_reserve * adj_high).astype(int)
+    zone_nums = range(1, len(_ZONE_LOW_PCT) + 1)
+    return dict(zip(zone_nums, zip(min_hrs.tolist(), max_hrs.tolist())))
 
 
+@st.cache_data(ttl=3600, show_spinner=False)
 def fetch_oura_data(access_token, n_days=30):
     """Fetch activity and readiness data from the Oura API."""
     headers = {"Authorization": f"Bearer {access_token}"}
@@ -72,71 +88,75 @@ def fetch_oura_data(access_token, n_days=30):
     }
 
     # Fetch activity data
-    activity_response = requests.get(
+    activity_response = get_http_session().get(
         f"https://api.ouraring.com/v2/usercollection/daily_activity", headers=headers, params=params,
     )
-    activity_data = activity_response.json()["data"]
-    activity_df = pd.DataFrame(activity_data)
-    activity_df = pd.concat(
-        [
-            activity_df.drop(columns=["contributors"]),
-            activity_df["contributors"].apply(pd.Series),
-        ],
-        axis=1,
-    ).rename(columns={"score": "activity_score"})
+    activity_data = orjson.loads(activity_response.content)["data"]
+    activity_df = (
+        pd.json_normalize(activity_data, sep="_")
+        .rename(columns=lambda col: col.removeprefix("contributors_"))
+        .rename(columns={"score": "activity_score"})
+    )
 
     # Fetch readiness data
-    readiness_response = requests.get(
+    readiness_response = get_http_session().get(
         f"https://api.ouraring.com/v2/usercollection/daily_readiness", headers=headers, params=params,
     )
-    readiness_data = readiness_response.json()["data"]
-    readiness_df = pd.DataFrame(readiness_data)
-    readiness_df = pd.concat(
-        [
-            readiness_df.drop(columns=["contributors"]),
-            readiness_df["contributors"].apply(pd.Series),
-        ],
-        axis=1,
-    ).rename(columns={"score": "readiness_score"})
-
-    # Merge dataframes on date
-    merged_df = pd.merge(
-        activity_df, readiness_df, on="day", suffixes=("_activity", "_readiness")
+    readiness_data = orjson.loads(readiness_response.content)["data"]
+    readiness_df = (
+        pd.json_normalize(readiness_data, sep="_")
+        .rename(columns=lambda col: col.removeprefix("contributors_"))
+        .rename(columns={"score": "readiness_score"})
+    )
+
+    # Join dataframes on date
+    merged_df = (
+        activity_df.set_index("day")
+        .join(
+            readiness_df.set_index("day"),
+            how="inner",
+            lsuffix="_activity",
+            rsuffix="_readiness",
+        )
+        .reset_index()
     )
+    # Downcast float columns to float32 to halve the cached frame's footprint
+    float_cols = merged_df.select_dtypes("float64").columns
+    merged_df[float_cols] = merged_df[float_cols].astype(np.float32)
 
     return merged_df
 
 
 def calculate_training_load_index(data):
     """Calculate the training index based on activity and readiness data."""
-    
-    # Calculate training load index - purely based on activity
-    data["training_load_index"] = (
-        normalize_column(data["activity_score"])
-        + normalize_column(data["medium_activity_met_minutes"])
-        + normalize_column(data["high_activity_met_minutes"])
-        + normalize_column(data["training_volume"])
-        + normalize_column(data["average_met_minutes"])
-    )
-    
+
+    # Calculate training load index - purely based on activity.
+    # Normalize all columns to 0-1 in one pass and sum across them.
+    values = data[_TRAINING_LOAD_COLUMNS].to_numpy(dtype=np.float32)
+    col_min = np.nanmin(values, axis=0)
+    col_range = np.nanmax(values, axis=0) - col_min
+    with np.errstate(divide="ignore", invalid="ignore"):
+        data["training_load_index"] = ((values - col_min) / col_range).sum(axis=1)
+
     return data
 
 
+@st.cache_data(ttl=3600, show_spinner=False)
 def fetch_user_max_hr(access_token):
     """Fetch the user's date of birth from the Oura API and calculate their age."""
     headers = {"Authorization": f"Bearer {access_token}"}
-    response = requests.get(
+    response = get_http_session().get(
         "https://api.ouraring.com/v2/usercollection/personal_info", headers=headers
     )
 
-    if response.status_code == 200:
-        user_info = response.json()
-        return 220 - user_info["age"]
-    else:
-        st.error("Failed to fetch user info.")
-        return None
+    # Raise rather than return None so failures are not cached
+    response.raise_for_status()
+
+    user_info = orjson.loads(response.content)
+    return 220 - user_info["age"]
 
 
+@st.cache_data(ttl=3600, show_spinner=False)
 def fetch_user_resting_hr(access_token, n_days=14):
     """Fetches user resting hr based ewm on resting HR from Oura API.
 
@@ -150,23 +170,28 @@ def fetch_user_resting_hr(access_token, n_days=14):
         "end_datetime": datetime.today().isoformat(),
     }
 
-    response = requests.get(
+    response = get_http_session().get(
         "https://api.ouraring.com/v2/usercollection/heartrate",
         headers=headers,
         params=parmas,
     )
 
-    if response.status_code == 200:
-        hr_data = response.json()["data"]
-        hr_df = pd.DataFrame(hr_data)
-        hr_df["day"] = pd.to_datetime(hr_df["timestamp"]).dt.date
-        resting_hr_df = hr_df.loc[hr_df["source"] == "rest"]
-        resting_hr_df = resting_hr_df.groupby("day").agg({"bpm": "mean"}).reset_index()
-        # EWM Resting HR
-        resting_hr_df["ewm_resting_hr"] = resting_hr_df["bpm"].ewm(span=14).mean()
+    # Raise rather than return None so failures are not cached
+    response.raise_for_status()
 
-        return resting_hr_df["ewm_resting_hr"].iloc[-1]
-
-    else:
-        st.error("Failed to fetch resting HR data.")
+    # Keep only resting samples before building the DataFrame
+    hr_data = [
+        sample for sample in orjson.loads(response.content)["data"]
+        if sample.get("source") == "rest"
+    ]
+    if not hr_data:
         return None
+
+    resting_hr_df = pd.DataFrame(hr_data)
+    day = pd.to_datetime(
+        resting_hr_df["timestamp"], format="ISO8601", utc=True
+    ).dt.floor("D")
+    daily_resting_hr = resting_hr_df["bpm"].groupby(day).mean()
+
+    # EWM Resting HR
+    return daily_resting_hr.ewm(span=14).mean().iat[-1]
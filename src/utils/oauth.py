@@ -1,8 +1,12 @@
+import streamlit as st
 from requests_oauthlib import OAuth2Session
-from dotenv import load_dotenv
+from dotenv import find_dotenv, load_dotenv
 import os
-# Load environment variables from .env file
-load_dotenv()
+# Load environment variables from .env file in development; in production
+# they come from the host environment and no .env file is found
+dotenv_path = find_dotenv()
+if dotenv_path:
+    load_dotenv(dotenv_path)
 
 # Oura API credentials
 CLIENT_ID = os.getenv("OURA_CLIENT_ID")
@@ -11,15 +15,20 @@ AUTHORIZATION_BASE_URL = os.getenv("AUTHORIZATION_BASE_URL")
 TOKEN_URL = os.getenv("OURA_TOKEN_URL")
 REDIRECT_URI = os.getenv("REDIRECT_URI")
 
+def _oauth_session():
+    """Return this user's OAuth2Session, creating it on first use."""
+    if "_oauth" not in st.session_state:
+        st.session_state["_oauth"] = OAuth2Session(CLIENT_ID, redirect_uri=REDIRECT_URI)
+    return st.session_state["_oauth"]
+
 def get_authorization_url():
-    """Generate the Oura authorization URL."""
-    oauth = OAuth2Session(CLIENT_ID, redirect_uri=REDIRECT_URI)
-    authorization_url, state = oauth.authorization_url(AUTHORIZATION_BASE_URL)
-    print(authorization_url) # Debugging line to print the UR
-    return authorization_url
+    """Return the Oura authorization URL, built once per user session."""
+    if "_oauth_url" not in st.session_state:
+        authorization_url, state = _oauth_session().authorization_url(AUTHORIZATION_BASE_URL)
+        st.session_state["_oauth_url"] = authorization_url
+    return st.session_state["_oauth_url"]
 
 def fetch_access_token(code):
     """Exchange the authorization code for an access token."""
-    oauth = OAuth2Session(CLIENT_ID, redirect_uri=REDIRECT_URI)
-    token = oauth.fetch_token(TOKEN_URL, client_secret=CLIENT_SECRET, code=code)
+    token = _oauth_session().fetch_token(TOKEN_URL, client_secret=CLIENT_SECRET, code=code)
     return token["access_token"]
\ No newline at end of file